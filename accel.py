@@ -0,0 +1,65 @@
+import numpy as np
+from numba import njit
+
+
+# Compiled once and cached on disk, so only the first run pays the JIT cost
+@njit(cache=True)
+def rolling_mean(x, window):
+    """Trailing mean over the last `window` values, skipping NaNs.
+
+    Rows where x is NaN stay NaN, matching the Rolling_Avg_Inflation
+    column of the bundled dataset (no rolling average for forecast rows).
+    """
+    n = x.shape[0]
+    out = np.empty(n)
+    total = 0.0
+    count = 0
+    for i in range(n):
+        if not np.isnan(x[i]):
+            total += x[i]
+            count += 1
+        if i >= window and not np.isnan(x[i - window]):
+            total -= x[i - window]
+            count -= 1
+        if np.isnan(x[i]) or count == 0:
+            out[i] = np.nan
+        else:
+            out[i] = total / count
+    return out
+
+
+@njit(cache=True, fastmath=True)
+def lttb_indices(x, y, n_out):
+    """Indices of the points picked by Largest-Triangle-Three-Buckets.
+
+    x must be increasing and neither array may contain NaNs.
+    """
+    n = x.shape[0]
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    out = np.empty(n_out, dtype=np.int64)
+    out[0] = 0
+    out[n_out - 1] = n - 1
+    every = (n - 2) / (n_out - 2)
+    a = 0
+    for i in range(n_out - 2):
+        # Average of the next bucket is the third triangle vertex
+        avg_start = int(np.floor((i + 1) * every)) + 1
+        avg_end = min(int(np.floor((i + 2) * every)) + 1, n)
+        avg_x = x[avg_start:avg_end].mean()
+        avg_y = y[avg_start:avg_end].mean()
+
+        # Keep the point of the current bucket with the largest triangle
+        start = int(np.floor(i * every)) + 1
+        end = int(np.floor((i + 1) * every)) + 1
+        max_area = -1.0
+        next_a = start
+        for j in range(start, end):
+            area = abs((x[a] - avg_x) * (y[j] - y[a]) - (x[a] - x[j]) * (avg_y - y[a]))
+            if area > max_area:
+                max_area = area
+                next_a = j
+        out[i + 1] = next_a
+        a = next_a
+    return out
@@ -1,9 +1,8 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
+import numpy as np
 import plotly.graph_objects as go
-import seaborn as sns
-import matplotlib.pyplot as plt
+from plotly.subplots import make_subplots
 from datetime import datetime
 
 # Set page config
@@ -13,21 +12,168 @@ st.set_page_config(
     layout="wide"
 )
 
+# Above this many rows, line traces are drawn with WebGL instead of SVG
+WEBGL_ROW_THRESHOLD = 1000
+
+# Frames longer than this are LTTB-downsampled before building line charts
+LTTB_SAMPLES = 1000
+
+# Trailing window (months) for Rolling_Avg_Inflation when the upload lacks it
+ROLLING_WINDOW = 12
+
+# Calendar order for the Month categorical and heatmap rows
+ALL_MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+              'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+def line_trace(frame):
+    return go.Scattergl if len(frame) > WEBGL_ROW_THRESHOLD else go.Scatter
+
+def lttb_view(frame, column):
+    """Rows of frame that keep the visual shape of column over Date."""
+    if len(frame) <= LTTB_SAMPLES:
+        return frame
+    from accel import lttb_indices
+
+    frame = frame[frame[column].notna()]
+    idx = lttb_indices(
+        frame['Date'].to_numpy().astype('int64').astype('float64'),
+        frame[column].to_numpy(dtype='float64'),
+        LTTB_SAMPLES
+    )
+    return frame.iloc[idx]
+
 # Cache data loading to improve performance
 @st.cache_data
 def load_data(uploaded_file):
     try:
-        df = pd.read_csv(uploaded_file, parse_dates=["Date"])
+        try:
+            # The pyarrow engine parses multi-threaded
+            df = pd.read_csv(uploaded_file, parse_dates=["Date"], engine="pyarrow")
+        except (ImportError, ValueError):
+            # Fall back to the default parser for layouts pyarrow rejects
+            uploaded_file.seek(0)
+            df = pd.read_csv(uploaded_file, parse_dates=["Date"])
         
         # Create additional columns
-        df['Year'] = df['Date'].dt.year
-        df['Month'] = df['Date'].dt.strftime('%b')
-        df['Inflation_Combined'] = df['Inflation Rate'].fillna(df['Forecast_Inflation'])
+        df['Year'] = df['Date'].dt.year.astype('int16')
+        df['Month'] = pd.Categorical(df['Date'].dt.strftime('%b'), categories=ALL_MONTHS, ordered=True)
+
+        # Actual rate where present, forecast otherwise
+        inflation_rate = df['Inflation Rate'].to_numpy()
+        forecast = df['Forecast_Inflation'].to_numpy()
+        is_forecast = np.isnan(inflation_rate)
+        df['Inflation_Combined'] = np.where(is_forecast, forecast, inflation_rate)
+
+        # Raw uploads may lack the rolling average; compute it with the JIT kernel
+        if 'Rolling_Avg_Inflation' not in df.columns:
+            from accel import rolling_mean
+            df['Rolling_Avg_Inflation'] = rolling_mean(inflation_rate.astype('float64'), ROLLING_WINDOW)
+
+        # First forecast date, stored with the cached frame as an ISO string
+        # (attrs must stay JSON-serializable for st.dataframe)
+        df.attrs['forecast_start'] = (
+            df['Date'].iloc[is_forecast.argmax()].isoformat() if is_forecast.any() else None
+        )
         return df
     except Exception as e:
         st.error(f"Error loading data: {e}")
         return None
 
+# Cheap enough to recompute each rerun: st.cache_data would hash and
+# unpickle the frame, which costs more than the work itself
+def filter_by_year(df, year_range):
+    # Mask on the raw int16 buffer to skip pandas index alignment
+    years = df["Year"].to_numpy()
+    return df.iloc[(years >= year_range[0]) & (years <= year_range[1])]
+
+def summary_stats(df):
+    inflation_rate = df["Inflation Rate"]
+    max_idx = inflation_rate.idxmax()
+    min_idx = inflation_rate.idxmin()
+
+    max_inflation_value = inflation_rate.at[max_idx]
+    min_inflation_value = inflation_rate.at[min_idx]
+
+    max_inflation_date = df.at[max_idx, "Date"].strftime("%B %Y")
+    min_inflation_date = df.at[min_idx, "Date"].strftime("%B %Y")
+
+    avg_forecast = df["Forecast_Inflation"].mean()
+    return (max_inflation_value, max_inflation_date,
+            min_inflation_value, min_inflation_date, avg_forecast)
+
+# Cache the expensive derived artifacts so widget reruns skip recomputation
+@st.cache_data
+def month_year_pivot(df):
+    # Monthly data normally has one row per (Month, Year), but an upload may
+    # hold both an actual and a forecast row for the same month (the bundled
+    # CSV does for Jan 2025). Check cheaply on integer keys before choosing.
+    keys = df['Year'].to_numpy().astype('int64') * 12 + df['Month'].cat.codes.to_numpy()
+    if len(np.unique(keys)) < len(keys):
+        # Average the duplicates. Month is an ordered categorical, so rows
+        # come out in calendar order and empty months are kept
+        return df.pivot_table(index='Month', columns='Year', values='Inflation_Combined',
+                              observed=False, dropna=False)
+    # Unique pairs: reshape without the groupby aggregation, then restore
+    # the months pivot drops when unobserved
+    pivot = df.pivot(index='Month', columns='Year', values='Inflation_Combined')
+    return pivot.reindex(ALL_MONTHS)
+
+@st.cache_data
+def encode_csv(df):
+    return df.to_csv(index=False).encode()
+
+# Figures are resources rather than data; cache them per upload (file_id) and year range
+@st.cache_resource(max_entries=32)
+def line_figure(data_key, year_range, _df, _filtered_df):
+    # Forecast start date, recorded once by load_data
+    forecast_start = _df.attrs['forecast_start']
+    Line = line_trace(_filtered_df)
+
+    # One figure with a shared date axis instead of three separate charts
+    fig = make_subplots(rows=3, cols=1, shared_xaxes=True, vertical_spacing=0.08,
+                        subplot_titles=("Inflation Trend Over Time (Actual + Forecast)",
+                                        "Rolling Average Inflation Trend",
+                                        "Actual vs Forecast Comparison"))
+
+    combined = lttb_view(_filtered_df, 'Inflation_Combined')
+    fig.add_trace(Line(x=combined['Date'], y=combined['Inflation_Combined'], mode='lines',
+                       name="Actual + Forecast", line=dict(color="#1f77b4")), row=1, col=1)
+
+    rolling = lttb_view(_filtered_df, 'Rolling_Avg_Inflation')
+    fig.add_trace(Line(x=rolling['Date'], y=rolling['Rolling_Avg_Inflation'], mode='lines',
+                       name="Rolling Avg", line=dict(color="#ff7f0e")), row=2, col=1)
+
+    actual = lttb_view(_filtered_df, 'Inflation Rate')
+    fig.add_trace(Line(x=actual['Date'], y=actual['Inflation Rate'], mode='lines',
+                       name="Inflation Rate", line=dict(color="green")), row=3, col=1)
+    forecast = lttb_view(_filtered_df, 'Forecast_Inflation')
+    fig.add_trace(Line(x=forecast['Date'], y=forecast['Forecast_Inflation'], mode='lines',
+                       name="Forecast_Inflation", line=dict(color="red")), row=3, col=1)
+
+    fig.update_yaxes(title_text="Inflation (%)", row=1, col=1)
+    fig.update_yaxes(title_text="Rolling Avg (%)", row=2, col=1)
+    fig.update_yaxes(title_text="Inflation (%)", row=3, col=1)
+    fig.update_layout(height=900)
+
+    # ✅ Add vertical dashed line for forecast start
+    if pd.notna(forecast_start):
+        fig.add_vline(x=forecast_start, line=dict(color="red", width=2, dash="dash"), row=1, col=1)
+
+        fig.add_annotation(
+            x=forecast_start,
+            xref="x",
+            yref="y domain",
+            # Inside the plot area, clear of the row-1 subplot title
+            y=0.95,
+            xanchor="left",
+            showarrow=False,
+            text=f"📉 Forecast Starts ({forecast_start[:4]})",
+            bgcolor="#ffffff",
+            font=dict(color="red", size=12)
+        )
+
+    return fig
+
 # Sidebar Controls
 st.sidebar.title("🔧 Dashboard Controls")
 
@@ -55,141 +201,65 @@ if uploaded_file is not None:
         show_stats = st.sidebar.checkbox("Show Summary Stats", value=True)
 
         # Filter by year
-        filtered_df = df[(df["Year"] >= year_range[0]) & (df["Year"] <= year_range[1])]
+        filtered_df = filter_by_year(df, year_range)
 
         # --- Summary Stats
         if show_stats:
             # Max / Min / Avg forecast
-            max_inflation_value = df["Inflation Rate"].max()
-            min_inflation_value = df["Inflation Rate"].min()
-            
-            max_inflation_date = pd.to_datetime(
-                df[df["Inflation Rate"] == max_inflation_value]["Date"].values[0]
-            ).strftime("%B %Y")
-            
-            min_inflation_date = pd.to_datetime(
-                df[df["Inflation Rate"] == min_inflation_value]["Date"].values[0]
-            ).strftime("%B %Y")
-            
-            avg_forecast = df["Forecast_Inflation"].mean()
+            (max_inflation_value, max_inflation_date,
+             min_inflation_value, min_inflation_date, avg_forecast) = summary_stats(df)
 
             # Layout columns
             col1, col2, col3 = st.columns(3)
 
             # 🔺 Max Inflation – Red ▲ + red date
-            col1.markdown(f"""
-            <div style="padding: 1rem; border: 1px solid #eee; border-radius: 12px; background-color:#ffecec;">
-                <h5 style="margin: 0; color: #d62728;">📈 Max Inflation</h5>
-                <h3 style="margin: 0; color: #d62728;">{max_inflation_value:.2f}%</h3>
-                <p style="margin: 0;">
-                    <span style='font-size:18px; color: #d62728;'>▲</span>
-                    <span style='color:#d62728;'>{max_inflation_date}</span>
-                </p>
-            </div>
-            """, unsafe_allow_html=True)
+            col1.metric("📈 Max Inflation", f"{max_inflation_value:.2f}%", max_inflation_date,
+                        delta_color="inverse")
 
             # 🔻 Min Inflation – Green ▼ + green date
-            col2.markdown(f"""
-            <div style="padding: 1rem; border: 1px solid #eee; border-radius: 12px; background-color:#e6ffed;">
-                <h5 style="margin: 0; color: #2ca02c;">📉 Min Inflation</h5>
-                <h3 style="margin: 0; color: #2ca02c;">{min_inflation_value:.2f}%</h3>
-                <p style="margin: 0;">
-                    <span style='font-size:18px; color: #2ca02c;'>▼</span>
-                    <span style='color:#2ca02c;'>{min_inflation_date}</span>
-                </p>
-            </div>
-            """, unsafe_allow_html=True)
-
-            # ℹ️ Forecast – Blue card + neutral coloring
-            col3.markdown(f"""
-            <div style="padding: 1rem; border: 1px solid #eee; border-radius: 12px; background-color:#eaf4ff;">
-                <h5 style="margin: 0; color: #007acc;">📘 Avg Forecast (2025–2028)</h5>
-                <h3 style="margin: 0; color: #007acc;">{avg_forecast:.2f}%</h3>
-                <p style="margin: 0;">
-                    <span style='font-size:18px; color: #1f77b4;'>ℹ️</span>
-                    <span style='color:#1f77b4;'>Informational</span>
-                </p>
-            </div>
-            """, unsafe_allow_html=True)
+            col2.metric("📉 Min Inflation", f"{min_inflation_value:.2f}%", min_inflation_date,
+                        delta_color="normal", delta_arrow="down")
+
+            # ℹ️ Forecast – neutral coloring
+            col3.metric("📘 Avg Forecast (2025–2028)", f"{avg_forecast:.2f}%", "Informational",
+                        delta_color="off", delta_arrow="off")
 
         # Add pleasing space between metrics and visualizations
         st.markdown("<br>", unsafe_allow_html=True)
         st.markdown("---")  # Horizontal separator
         st.markdown("<br>", unsafe_allow_html=True)
 
-        # Dynamically determine forecast start date
-        forecast_start = df[df['Inflation Rate'].isna()]['Date'].min()
-
         # --- Chart Sections
         if chart_type == "Line Charts":
             st.subheader("📈 Monthly Inflation Rate (Actual + Forecast)")
 
-            fig = px.line(filtered_df, x='Date', y='Inflation_Combined',
-                          title="Inflation Trend Over Time (Actual + Forecast)",
-                          labels={"Inflation_Combined": "Inflation (%)"},
-                          color_discrete_sequence=["#1f77b4"])
-
-            # ✅ Add vertical dashed line for forecast start
-            if pd.notna(forecast_start):
-                fig.add_shape(
-                    type="line",
-                    x0=forecast_start,
-                    x1=forecast_start,
-                    y0=0,
-                    y1=1,
-                    xref='x',
-                    yref='paper',
-                    line=dict(color="red", width=2, dash="dash")
-                )
-
-                fig.add_annotation(
-                    x=forecast_start,
-                    yref="paper",
-                    y=1.05,
-                    showarrow=False,
-                    text=f"📉 Forecast Starts ({forecast_start.strftime('%Y')})",
-                    bgcolor="#ffffff",
-                    font=dict(color="red", size=12)
-                )
-
-            st.plotly_chart(fig, use_container_width=True)
-
-            # ✅ ROLLING AVG BLOCK - properly aligned
-            st.subheader("🌀 Rolling Average Inflation Rate")
-            fig2 = px.line(filtered_df, x="Date", y="Rolling_Avg_Inflation",
-                           title="Rolling Average Inflation Trend",
-                           labels={"Rolling_Avg_Inflation": "Rolling Avg (%)"},
-                           color_discrete_sequence=["#ff7f0e"])
-            st.plotly_chart(fig2, use_container_width=True)
-
-            # ✅ ACTUAL vs FORECAST
-            st.subheader("🔮 Actual vs Forecast Inflation Curve")
-            fig3 = px.line(df, x="Date", y=["Inflation Rate", "Forecast_Inflation"],
-                           labels={"value": "Inflation (%)", "variable": "Data Type"},
-                           color_discrete_map={"Inflation Rate": "green", "Forecast_Inflation": "red"},
-                           title="Actual vs Forecast Comparison")
-            st.plotly_chart(fig3, use_container_width=True)
+            fig = line_figure(uploaded_file.file_id, year_range, df, filtered_df)
+            st.plotly_chart(fig, width="stretch")
 
         elif chart_type == "Heatmap":
             st.subheader("🔥 Month-Year Heatmap of Inflation Rates")
 
-            heat_df = filtered_df.copy()
-            pivot = heat_df.pivot_table(index='Month', columns='Year', values='Inflation_Combined')
-            # Reorder months
-            all_months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 
-                          'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
-            pivot = pivot.reindex(all_months)
+            pivot = month_year_pivot(filtered_df)
 
-            fig4, ax4 = plt.subplots(figsize=(14, 6))
-            sns.heatmap(pivot, annot=True, fmt=".1f", cmap="YlOrRd", linewidths=.5, ax=ax4)
-            ax4.set_title("Monthly Inflation Heatmap by Year")
-            st.pyplot(fig4)
+            fig4 = go.Figure(go.Heatmap(
+                z=pivot.values,
+                x=pivot.columns.astype(str),
+                y=pivot.index.astype(str),
+                colorscale="YlOrRd",
+                texttemplate="%{z:.1f}",
+                xgap=1,
+                ygap=1
+            ))
+            # Keep January at the top, as in a table
+            fig4.update_layout(title="Monthly Inflation Heatmap by Year", yaxis_autorange="reversed")
+            st.plotly_chart(fig4, width="stretch")
 
         elif chart_type == "Raw Data":
             st.subheader("📄 View Filtered Raw Dataset")
-            st.dataframe(filtered_df, use_container_width=True)
+            # Fixed-height viewport so the grid virtualizes rows instead of laying out the whole frame
+            st.dataframe(filtered_df, width="stretch", height=400)
 
-            csv = filtered_df.to_csv(index=False).encode()
+            csv = encode_csv(filtered_df)
             st.download_button("📥 Download Filtered CSV", csv, "filtered_inflation.csv", "text/csv")
 
         # --- Footer